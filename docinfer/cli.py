@@ -1,12 +1,21 @@
 """CLI entry point for PDF Metadata Extractor."""
 
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import typer
 from rich.console import Console
 
-from docinfer.models.config import ExtractionConfig, OutputConfig
+from docinfer.models.config import (
+    DEFAULT_MODEL,
+    ExtractionConfig,
+    OutputConfig,
+    Quantization,
+)
+
+if TYPE_CHECKING:
+    from docinfer.models.metadata import BatchResult, MetadataResult
 
 console = Console()
 
@@ -34,17 +43,23 @@ def main(
     export: Optional[Path] = typer.Option(
         None,
         "--export",
-        help="Export results to JSON file",
+        help="Export results to JSON file (JSON Lines for a directory)",
     ),
     no_ai: bool = typer.Option(
         False,
         "--no-ai",
         help="Skip AI analysis, show embedded metadata only",
     ),
-    model: str = typer.Option(
-        "gemma3:4b",
+    model: Optional[str] = typer.Option(
+        None,
         "--model",
         help="Ollama model to use for AI analysis",
+        show_default=f"{DEFAULT_MODEL}-q4_K_M",
+    ),
+    quantization: Quantization = typer.Option(
+        Quantization.Q4_K_M,
+        "--quantization",
+        help="Quantization of the default model (ignored with --model)",
     ),
     quiet: bool = typer.Option(
         False,
@@ -52,6 +67,11 @@ def main(
         "-q",
         help="Suppress progress output",
     ),
+    tree: bool = typer.Option(
+        False,
+        "--tree",
+        help="Show a single file's metadata as a tree",
+    ),
 ) -> None:
     """Extract metadata from PDF files.
 
@@ -65,12 +85,14 @@ def main(
     # Build configuration
     extraction_config = ExtractionConfig(
         model_name=model,
+        quantization=quantization,
         skip_ai=no_ai,
     )
     output_config = OutputConfig(
         json_output=json_output,
         export_path=export,
         quiet=quiet,
+        tree=tree,
     )
 
     # Import here to avoid circular imports and allow lazy loading
@@ -95,18 +117,28 @@ def _process_single_file(
         display_error,
         display_metadata,
         display_warning,
-        output_json,
+        output_json_bytes,
     )
-    from docinfer.services.pdf_extractor import extract_embedded_metadata, extract_text
+    from docinfer.services.pdf_extractor import extract_all
 
     # Validate file extension
     if file_path.suffix.lower() != ".pdf":
         display_error(f"File is not a PDF: {file_path}", console)
         raise typer.Exit(1)
 
-    # Extract embedded metadata
+    # Start loading the AI model while the PDF is parsed
+    if not extraction_config.skip_ai:
+        from docinfer.services.ai_analyzer import is_ollama_available, warm_up_model
+
+        if is_ollama_available(extraction_config.model_name):
+            warm_up_model(extraction_config.model_name)
+
+    # Extract embedded metadata, plus text for AI analysis
+    max_pages = 0 if extraction_config.skip_ai else extraction_config.max_pages
     try:
-        embedded, page_count, warnings = extract_embedded_metadata(file_path)
+        embedded, page_count, warnings, text_content, pages_analyzed = extract_all(
+            file_path, max_pages, extraction_config.max_chars
+        )
     except FileNotFoundError:
         display_error(f"File not found: {file_path}", console)
         raise typer.Exit(1)
@@ -117,18 +149,8 @@ def _process_single_file(
         display_error(str(e), console)
         raise typer.Exit(1)
 
-    # Extract text for AI analysis
-    text_content = ""
-    pages_analyzed = 0
-    if not extraction_config.skip_ai:
-        try:
-            text_content, pages_analyzed = extract_text(
-                file_path, extraction_config.max_pages
-            )
-            if not text_content.strip():
-                warnings.append("No extractable text found - AI summary unavailable")
-        except Exception as e:
-            warnings.append(f"Text extraction failed: {e}")
+    if pages_analyzed and not text_content.strip():
+        warnings.append("No extractable text found - AI summary unavailable")
 
     # Build result
     from docinfer.models.metadata import MetadataResult
@@ -176,15 +198,13 @@ def _process_single_file(
 
     # Output result
     if output_config.json_output:
-        json_str = output_json(result)
-        console.print(json_str)
+        _print_json(result)
     else:
-        display_metadata(result, console)
+        display_metadata(result, console, tree=output_config.tree)
 
     # Export if requested
     if output_config.export_path:
-        json_str = output_json(result)
-        output_config.export_path.write_text(json_str)
+        output_config.export_path.write_bytes(output_json_bytes(result))
         if not output_config.quiet:
             console.print(f"\n[green]Exported to:[/green] {output_config.export_path}")
 
@@ -203,9 +223,12 @@ def _process_directory(
     from docinfer.services.output import (
         display_batch_result,
         display_error,
-        output_json,
     )
-    from docinfer.services.pdf_extractor import find_pdfs, process_directory
+    from docinfer.services.pdf_extractor import (
+        find_pdfs,
+        process_directory,
+        process_directory_stream,
+    )
 
     pdf_files = find_pdfs(directory)
 
@@ -213,23 +236,60 @@ def _process_directory(
         display_error(f"No PDF files found in: {directory}", console)
         raise typer.Exit(1)
 
-    result = process_directory(
-        directory, pdf_files, extraction_config, output_config, console
-    )
+    if output_config.export_path:
+        # Write each result as it completes (JSON Lines) instead of holding
+        # the whole batch in memory; only the counts are kept for display
+        from pydantic_core import to_json
+
+        from docinfer.models.metadata import BatchResult
+        from docinfer.services.output import output_json_bytes
+
+        errors: list[dict] = []
+        successful = 0
+        with output_config.export_path.open("wb") as export_file:
+            for r in process_directory_stream(
+                pdf_files, extraction_config, output_config, console, errors
+            ):
+                export_file.write(output_json_bytes(r, indent=None) + b"\n")
+                successful += 1
+            # Failed files follow the results, tagged so readers can tell
+            # them apart from MetadataResult records
+            for err in errors:
+                export_file.write(to_json({"type": "error", **err}) + b"\n")
+
+        result = BatchResult(
+            directory=directory,
+            total_files=len(pdf_files),
+            successful=successful,
+            failed=len(errors),
+            results=[],
+            errors=errors,
+        )
+    else:
+        result = process_directory(
+            directory, pdf_files, extraction_config, output_config, console
+        )
 
-    # Output result
+    # Output result; exported results are only in the export file, so the
+    # JSON summary leaves out the empty results list
     if output_config.json_output:
-        json_str = output_json(result)
-        console.print(json_str)
+        _print_json(result, exclude={"results"} if output_config.export_path else None)
     else:
         display_batch_result(result, console)
 
-    # Export if requested
-    if output_config.export_path:
-        json_str = output_json(result)
-        output_config.export_path.write_text(json_str)
-        if not output_config.quiet:
-            console.print(f"\n[green]Exported to:[/green] {output_config.export_path}")
+    if output_config.export_path and not output_config.quiet:
+        console.print(f"\n[green]Exported to:[/green] {output_config.export_path}")
+
+
+def _print_json(
+    result: "MetadataResult | BatchResult", exclude: Optional[set[str]] = None
+) -> None:
+    """Write result as JSON bytes straight to stdout, bypassing Rich."""
+    from docinfer.services.output import output_json_bytes
+
+    sys.stdout.flush()
+    sys.stdout.buffer.write(output_json_bytes(result, exclude=exclude) + b"\n")
+    sys.stdout.buffer.flush()
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ from docinfer.models.metadata import (
     MetadataResult,
     BatchResult,
 )
-from docinfer.models.config import ExtractionConfig, OutputConfig
+from docinfer.models.config import ExtractionConfig, OutputConfig, Quantization
 
 __all__ = [
     "EmbeddedMetadata",
@@ -15,4 +15,5 @@ __all__ = [
     "BatchResult",
     "ExtractionConfig",
     "OutputConfig",
+    "Quantization",
 ]
@@ -1,8 +1,21 @@
 """Configuration models for metadata extraction."""
 
+from enum import Enum
 from pathlib import Path
+from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+# Default Ollama model, completed with a quantization suffix
+DEFAULT_MODEL = "gemma3:4b-it"
+
+
+class Quantization(str, Enum):
+    """Quantization variants of the default model."""
+
+    Q4_K_M = "q4_K_M"
+    Q8_0 = "q8_0"
+    FP16 = "fp16"
 
 
 class ExtractionConfig(BaseModel):
@@ -11,13 +24,41 @@ class ExtractionConfig(BaseModel):
     max_pages: int = Field(
         default=10, description="Maximum pages to analyze", ge=1, le=100
     )
-    model_name: str = Field(default="gemma3:4b", description="Ollama model to use")
+    max_chars: int = Field(
+        default=12000,
+        description=(
+            "Stop extracting text once this many characters are collected "
+            "(the AI only sees the first ~8000)"
+        ),
+        ge=1,
+    )
+    model_name: str = Field(
+        default=f"{DEFAULT_MODEL}-q4_K_M", description="Ollama model to use"
+    )
+    quantization: Quantization = Field(
+        default=Quantization.Q4_K_M,
+        description=(
+            "Quantization of the default model. q4_K_M decodes about twice as "
+            "fast as fp16 with a quarter of the memory and is accurate enough "
+            "for metadata extraction; q8_0 and fp16 trade speed and memory for "
+            "accuracy. Ignored when model_name is given explicitly."
+        ),
+    )
     skip_ai: bool = Field(default=False, description="Skip AI analysis")
     temperature: float = Field(
         default=0.0, description="LLM temperature", ge=0.0, le=2.0
     )
     timeout_seconds: int = Field(default=120, description="AI analysis timeout", ge=10)
 
+    @model_validator(mode="before")
+    @classmethod
+    def _default_model_for_quantization(cls, data: Any) -> Any:
+        """Pick the default model variant matching the requested quantization."""
+        if isinstance(data, dict) and data.get("model_name") is None:
+            quantization = Quantization(data.get("quantization") or Quantization.Q4_K_M)
+            data = {**data, "model_name": f"{DEFAULT_MODEL}-{quantization.value}"}
+        return data
+
 
 class OutputConfig(BaseModel):
     """Configuration for output formatting."""
@@ -25,3 +66,4 @@ class OutputConfig(BaseModel):
     json_output: bool = Field(default=False, description="Output as JSON")
     export_path: Path | None = Field(default=None, description="Export to file")
     quiet: bool = Field(default=False, description="Suppress progress output")
+    tree: bool = Field(default=False, description="Show metadata as a tree")
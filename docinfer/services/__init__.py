@@ -1,6 +1,7 @@
 """Services for PDF extraction, AI analysis, and output formatting."""
 
 from docinfer.services.pdf_extractor import (
+    extract_all,
     extract_embedded_metadata,
     extract_text,
     find_pdfs,
@@ -10,6 +11,7 @@ from docinfer.services.output import (
     display_error,
     display_warning,
     output_json,
+    output_json_bytes,
 )
 from docinfer.services.ai_analyzer import (
     analyze_content,
@@ -19,6 +21,7 @@ from docinfer.services.ai_analyzer import (
 )
 
 __all__ = [
+    "extract_all",
     "extract_embedded_metadata",
     "extract_text",
     "find_pdfs",
@@ -26,6 +29,7 @@ __all__ = [
     "display_error",
     "display_warning",
     "output_json",
+    "output_json_bytes",
     "analyze_content",
     "is_ollama_available",
     "is_ollama_running",
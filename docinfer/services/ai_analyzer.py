@@ -1,12 +1,122 @@
-"""AI analysis service using LangChain and Ollama."""
-
-import subprocess
+"""AI analysis service using Ollama structured outputs."""
+
+import os
+import re
+import socket
+import sys
+import threading
+import time
+from functools import lru_cache
 from typing import Optional
+from urllib.parse import urlsplit
 
 from docinfer.models.config import ExtractionConfig
 from docinfer.models.metadata import AIMetadata, EmbeddedMetadata
 from docinfer.prompts.metadata import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
 
+OLLAMA_HOST = "http://localhost:11434"
+
+# How long Ollama keeps the model loaded after each request
+OLLAMA_KEEP_ALIVE = "30m"
+
+
+def _num_parallel(default: int = 4) -> int:
+    """Read the number of concurrent Ollama requests from the environment.
+
+    DOCINFER_NUM_PARALLEL should match the server's OLLAMA_NUM_PARALLEL.
+    A value that is not an integer falls back to the default, and values
+    below 1 are raised to 1 so the request semaphore can open.
+    """
+    try:
+        return max(1, int(os.environ.get("DOCINFER_NUM_PARALLEL", default)))
+    except ValueError:
+        return default
+
+
+# Concurrent requests sent to Ollama
+OLLAMA_NUM_PARALLEL = _num_parallel()
+
+# Keep first ~8000 chars of document text for context
+MAX_CHARS = 8000
+
+# Context window requested from Ollama; fits the prompt, ~8000 chars of
+# text and the JSON response
+NUM_CTX = 4096
+
+_AI_METADATA_SCHEMA = AIMetadata.model_json_schema()
+
+# The user prompt around the document text, split once instead of running
+# str.format on every request
+_PROMPT_PREFIX, _PROMPT_SUFFIX = USER_PROMPT_TEMPLATE.split("{text}")
+
+# Keep alphanumeric, hyphen, dot, brackets in suggested filenames
+_INVALID_FILENAME_CHARS = re.compile(r"[^a-z0-9\-.\[\]()]+")
+_REPEATED_HYPHENS = re.compile(r"-{2,}")
+# topic-title-[author]-[year].pdf; the prompt asks for "unknown" in place of
+# a missing author or year, so an author is only read before a year slot
+_FN_RE = re.compile(
+    r"^(?P<title>.+?)(?:-(?P<author>[a-z]+)-(?P<year>\d{4}|unknown))?\.pdf$"
+)
+
+# How long an Ollama status check (running, models) is reused
+STATUS_TTL_SECONDS = 30.0
+
+_status_cache: Optional[tuple[float, bool, frozenset[str]]] = None
+
+
+def _port_open() -> bool:
+    """Probe the Ollama port without making an HTTP request.
+
+    Returns:
+        True if something accepts connections on the Ollama host/port
+    """
+    url = urlsplit(OLLAMA_HOST)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(0.2)
+    try:
+        return sock.connect_ex((url.hostname or "127.0.0.1", url.port or 11434)) == 0
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def _list_models() -> frozenset[str]:
+    """Fetch the names of locally available models from the Ollama API.
+
+    Returns:
+        Set of model names, empty if the request fails
+    """
+    import httpx
+
+    try:
+        response = httpx.get(f"{OLLAMA_HOST}/api/tags", timeout=2.0)
+        response.raise_for_status()
+        return frozenset(m["name"] for m in response.json().get("models", []))
+    except (httpx.HTTPError, ValueError, KeyError):
+        return frozenset()
+
+
+def _ollama_status() -> tuple[bool, frozenset[str]]:
+    """Return whether Ollama is running and which models it has.
+
+    The model list is only requested when the port probe succeeds. The
+    result is cached for STATUS_TTL_SECONDS.
+
+    Returns:
+        Tuple of (running, model_names)
+    """
+    global _status_cache
+
+    now = time.monotonic()
+    if _status_cache is not None and now - _status_cache[0] < STATUS_TTL_SECONDS:
+        return _status_cache[1], _status_cache[2]
+
+    running = _port_open()
+    models = _list_models() if running else frozenset()
+    _status_cache = (now, running, models)
+    return running, models
+
 
 def is_ollama_running() -> bool:
     """Check if Ollama service is running.
@@ -14,43 +124,28 @@ def is_ollama_running() -> bool:
     Returns:
         True if Ollama is available, False otherwise
     """
-    try:
-        result = subprocess.run(
-            ["ollama", "list"],
-            capture_output=True,
-            timeout=5,
-        )
-        return result.returncode == 0
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return False
+    return _ollama_status()[0]
 
 
 def is_model_available(model_name: str) -> bool:
     """Check if a specific Ollama model is available.
 
     Args:
-        model_name: Name of the model to check (e.g., "gemma2")
+        model_name: Name of the model to check (e.g., "gemma2", "gemma3:4b")
 
     Returns:
         True if model is available, False otherwise
     """
-    try:
-        result = subprocess.run(
-            ["ollama", "list"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode != 0:
-            return False
-
-        # Check if model name appears in output
-        # Handle both "gemma2" and "gemma2:latest" formats
-        base_model = model_name.split(":")[0]
-        return base_model in result.stdout
-    except (FileNotFoundError, subprocess.TimeoutExpired):
+    running, models = _ollama_status()
+    if not running:
         return False
 
+    # "gemma2" is short for "gemma2:latest"; an explicit tag such as
+    # "gemma3:4b-it-q4_K_M" must be pulled exactly
+    if ":" not in model_name:
+        model_name += ":latest"
+    return model_name in models
+
 
 def is_ollama_available(model_name: str) -> bool:
     """Check if Ollama is running and model is available.
@@ -64,6 +159,36 @@ def is_ollama_available(model_name: str) -> bool:
     return is_ollama_running() and is_model_available(model_name)
 
 
+def preload_model(model_name: str) -> None:
+    """Ask Ollama to load a model so the first real request skips the load.
+
+    Args:
+        model_name: Name of the model to load
+    """
+    import httpx
+
+    try:
+        httpx.post(
+            f"{OLLAMA_HOST}/api/generate",
+            json={"model": model_name, "prompt": "", "keep_alive": OLLAMA_KEEP_ALIVE},
+            timeout=60.0,
+        )
+    except httpx.HTTPError:
+        # Not fatal - the first request will load the model instead
+        pass
+
+
+def warm_up_model(model_name: str) -> None:
+    """Preload a model in a background thread.
+
+    Lets the model load while PDFs are still being parsed.
+
+    Args:
+        model_name: Name of the model to load
+    """
+    threading.Thread(target=preload_model, args=(model_name,), daemon=True).start()
+
+
 def analyze_content(text: str, config: ExtractionConfig) -> Optional[AIMetadata]:
     """Analyze document content using AI to generate metadata.
 
@@ -75,56 +200,135 @@ def analyze_content(text: str, config: ExtractionConfig) -> Optional[AIMetadata]
         AIMetadata if successful, None if analysis fails
     """
     try:
-        from langchain_ollama import ChatOllama
-
-        # Initialize LLM with structured output
-        llm = ChatOllama(
-            model=config.model_name,
-            temperature=config.temperature,
+        response = _get_client(config.timeout_seconds).chat(
+            **_chat_kwargs(text, config)
         )
+        return _parse_response(response)
 
-        # Use structured output with Pydantic model
-        structured_llm = llm.with_structured_output(AIMetadata)
+    except Exception as e:
+        # Log error but don't raise - allow graceful fallback
+        print(f"AI analysis error: {e}", file=sys.stderr)
+        return None
 
-        # Truncate text if too long (keep first ~8000 chars for context)
-        max_chars = 8000
-        if len(text) > max_chars:
-            text = text[:max_chars] + "\n\n[Text truncated...]"
 
-        # Build messages
-        messages = [
-            ("system", SYSTEM_PROMPT),
-            ("human", USER_PROMPT_TEMPLATE.format(text=text)),
-        ]
+@lru_cache(maxsize=1)
+def _get_client(timeout_seconds: int):
+    """Create the Ollama client once and reuse its connection pool."""
+    from ollama import Client
 
-        # Invoke with timeout handling
-        result = structured_llm.invoke(messages)
+    return Client(host=OLLAMA_HOST, timeout=timeout_seconds)
 
-        if isinstance(result, AIMetadata):
-            # Ensure keywords are properly formatted with #
-            result.keywords = [
-                kw if kw.startswith("#") else f"#{kw}" for kw in result.keywords
-            ]
-            # Ensure keywords are lowercase
-            result.keywords = [kw.lower() for kw in result.keywords]
 
-            # Ensure filename ends with .pdf
-            if not result.suggested_filename.endswith(".pdf"):
-                result.suggested_filename += ".pdf"
+def analyze_contents(
+    texts: list[str], config: ExtractionConfig
+) -> list[Optional[AIMetadata]]:
+    """Analyze several documents concurrently using AI.
 
-            # Clean up filename
-            result.suggested_filename = _clean_filename(result.suggested_filename)
+    Requests are sent in parallel (up to OLLAMA_NUM_PARALLEL at a time) so
+    Ollama can batch them instead of serving one document at a time.
 
-            return result
+    Args:
+        texts: Extracted text for each PDF
+        config: Extraction configuration
 
-        return None
+    Returns:
+        AIMetadata (or None if analysis failed) for each text, in input order
+    """
+    import asyncio
 
-    except Exception as e:
-        # Log error but don't raise - allow graceful fallback
-        import sys
+    return asyncio.run(_analyze_batch(texts, config))
 
-        print(f"AI analysis error: {e}", file=sys.stderr)
-        return None
+
+async def _analyze_batch(
+    texts: list[str], config: ExtractionConfig
+) -> list[Optional[AIMetadata]]:
+    """Send all texts to Ollama concurrently, bounded by a semaphore."""
+    import asyncio
+
+    from ollama import AsyncClient
+
+    semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+
+    async with AsyncClient(host=OLLAMA_HOST, timeout=config.timeout_seconds) as client:
+
+        async def analyze_one(text: str) -> Optional[AIMetadata]:
+            async with semaphore:
+                try:
+                    response = await client.chat(**_chat_kwargs(text, config))
+                    return _parse_response(response)
+                except Exception as e:
+                    print(f"AI analysis error: {e}", file=sys.stderr)
+                    return None
+
+        # Dispatch in order of length so requests sharing the server's parallel
+        # slots are of similar size and no batch waits on one huge prompt
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        analyzed = await asyncio.gather(*(analyze_one(texts[i]) for i in order))
+
+    results: list[Optional[AIMetadata]] = [None] * len(texts)
+    for i, result in zip(order, analyzed):
+        results[i] = result
+    return results
+
+
+def _chat_kwargs(text: str, config: ExtractionConfig) -> dict:
+    """Build the chat request for a document, shared by both clients."""
+    return {
+        "model": config.model_name,
+        "messages": _build_messages(text),
+        "format": _AI_METADATA_SCHEMA,
+        "options": {"temperature": config.temperature, "num_ctx": NUM_CTX},
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+    }
+
+
+def _parse_response(response) -> AIMetadata:
+    """Validate and normalize the structured output of a chat response."""
+    result = AIMetadata.model_validate_json(response.message.content)
+    return _normalize_result(result)
+
+
+def _build_messages(text: str) -> list[dict[str, str]]:
+    """Build the chat messages for a document, truncating long text."""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": _PROMPT_PREFIX + _truncate(text) + _PROMPT_SUFFIX},
+    ]
+
+
+def _truncate(text: str) -> str:
+    """Truncate text to MAX_CHARS at a paragraph or sentence boundary.
+
+    Falls back to a hard cut if no boundary is found in the second half of
+    the allowed length.
+    """
+    if len(text) <= MAX_CHARS:
+        return text
+
+    cut = text.rfind("\n\n", MAX_CHARS // 2, MAX_CHARS)
+    if cut == -1:
+        cut = text.rfind(". ", MAX_CHARS // 2, MAX_CHARS)
+        # Keep the full stop
+        cut = cut + 1 if cut != -1 else MAX_CHARS
+
+    return text[:cut] + "\n\n[Text truncated...]"
+
+
+def _normalize_result(result: AIMetadata) -> AIMetadata:
+    """Normalize keywords and suggested filename of an AI result."""
+    # Ensure keywords are properly formatted with #
+    result.keywords = [kw if kw.startswith("#") else f"#{kw}" for kw in result.keywords]
+    # Ensure keywords are lowercase
+    result.keywords = [kw.lower() for kw in result.keywords]
+
+    # Ensure filename ends with .pdf
+    if not result.suggested_filename.endswith(".pdf"):
+        result.suggested_filename += ".pdf"
+
+    # Clean up filename
+    result.suggested_filename = _clean_filename(result.suggested_filename)
+
+    return result
 
 
 def _clean_filename(filename: str) -> str:
@@ -146,12 +350,10 @@ def _clean_filename(filename: str) -> str:
     filename = filename.lower()
 
     # Remove multiple consecutive hyphens
-    while "--" in filename:
-        filename = filename.replace("--", "-")
+    filename = _REPEATED_HYPHENS.sub("-", filename)
 
     # Remove invalid characters (keep alphanumeric, hyphen, dot, brackets)
-    valid_chars = set("abcdefghijklmnopqrstuvwxyz0123456789-.[]()")
-    filename = "".join(c for c in filename if c in valid_chars)
+    filename = _INVALID_FILENAME_CHARS.sub("", filename)
 
     # Ensure .pdf extension
     if not filename.endswith(".pdf"):
@@ -177,31 +379,14 @@ def merge_ai_into_embedded(
     """
     # Extract author and title from suggested filename
     # Format: topic-title-[author]-[year].pdf
-    filename = ai_metadata.suggested_filename.replace(".pdf", "")
-    parts = filename.split("-")
-
-    extracted_author = None
-    extracted_title = None
-
-    # Try to extract author and year from filename
-    # Typical format: topic-title-author-year
-    if len(parts) >= 2:
-        # Last part is usually the year (4 digits)
-        if parts[-1].isdigit() and len(parts[-1]) == 4:
-            # Second to last before year is likely author
-            if len(parts) >= 3:
-                extracted_author = parts[-2]
-        else:
-            # If no year, last part might be author
-            extracted_author = parts[-1]
-
-        # Everything except last 1-2 parts is the title
-        if extracted_author and len(parts) > 2:
-            title_parts = parts[:-2] if parts[-1].isdigit() else parts[:-1]
-            extracted_title = " ".join(title_parts).title()
+    match = _FN_RE.match(ai_metadata.suggested_filename.lower())
+    extracted_title = match.group("title").replace("-", " ").title() if match else None
+    extracted_author = match.group("author") if match else None
+    if extracted_author == "unknown":
+        extracted_author = None
 
     # Create updated metadata with AI-extracted info for missing fields
-    return EmbeddedMetadata(
+    return EmbeddedMetadata.model_construct(
         title=embedded.title or extracted_title,
         author=embedded.author or extracted_author,
         subject=embedded.subject or ai_metadata.category,
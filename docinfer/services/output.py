@@ -1,68 +1,199 @@
 """Rich output formatting service."""
 
+from __future__ import annotations
+
+import math
 from contextlib import contextmanager
-from typing import Generator
+from functools import lru_cache
+from itertools import accumulate
+from typing import IO, TYPE_CHECKING, Generator
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-from rich.tree import Tree
+from pydantic import TypeAdapter
+from rich.markup import escape
+from rich.text import Text
 
 from docinfer.models.metadata import BatchResult, MetadataResult
 
-
-def display_metadata(result: MetadataResult, console: Console) -> None:
+# Rich's heavier renderables are imported where they are used, so commands
+# that never draw them (e.g. --json) do not pay for loading them
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.progress import Progress
+    from rich.tree import Tree
+
+# Static labels, parsed from markup once instead of on every display
+_PANEL_TITLE = Text.from_markup("[bold]PDF Metadata[/bold]")
+_EMBEDDED_HEADER = Text.from_markup("[bold cyan]EMBEDDED METADATA[/bold cyan]")
+_AI_HEADER = Text.from_markup("[bold magenta]AI-GENERATED (via Gemma)[/bold magenta]")
+_NOT_AVAILABLE = Text.from_markup("[dim]Not available[/dim]")
+
+# JSON serializers built once per result type and reused for every dump
+_JSON_ADAPTERS = {
+    MetadataResult: TypeAdapter(MetadataResult),
+    BatchResult: TypeAdapter(BatchResult),
+}
+
+
+def display_metadata(
+    result: MetadataResult, console: Console, tree: bool = False
+) -> None:
     """Display metadata result with Rich formatting.
 
     Args:
         result: MetadataResult to display
         console: Rich console for output
+        tree: Render the metadata as a Rich Tree instead of plain lines
     """
-    tree = Tree(f"[bold blue]{result.file_name}[/bold blue]")
+    if not console.is_terminal:
+        _plain_metadata(result, console.file)
+        return
+
+    if tree:
+        _display_metadata_tree(result, console)
+        return
+
+    from rich.panel import Panel
+
+    embedded = result.embedded
+    created = embedded.creation_date
+    modified = embedded.modification_date
+
+    # Built from Text pieces so values are never parsed as markup and the
+    # static labels are shared with the tree view
+    lines = [
+        Text(result.file_name, style="bold blue"),
+        Text(),
+        _EMBEDDED_HEADER,
+        _field_text("Title", embedded.title),
+        _field_text("Author", embedded.author),
+        _field_text("Subject", embedded.subject),
+        _field_text("Creator", embedded.creator),
+        _field_text("Producer", embedded.producer),
+        _field_text("Created", created.date().isoformat() if created else None),
+        _field_text("Modified", modified.date().isoformat() if modified else None),
+        Text(f"  Pages: {result.page_count} (analyzed: {result.pages_analyzed})"),
+    ]
+
+    # AI-generated section
+    if result.ai_generated:
+        ai = result.ai_generated
+        summary_lines = _wrap_text(ai.summary, 60)
+        lines += [
+            Text(),
+            _AI_HEADER,
+            Text(f"  Summary: {summary_lines[0]}"),
+            *(Text(f"           {line}") for line in summary_lines[1:]),
+            Text(f"  Keywords: {' '.join(ai.keywords)}"),
+            Text(f"  Category: {ai.category}"),
+            Text.assemble("  Suggested: ", (ai.suggested_filename, "green")),
+        ]
+
+    panel = Panel(
+        Text("\n").join(lines),
+        title=_PANEL_TITLE,
+        border_style="blue",
+    )
+    console.print(panel)
+
+
+def _plain_metadata(result: MetadataResult, file: IO[str]) -> None:
+    """Write metadata result as plain text, for output that is not a terminal."""
+    embedded = result.embedded
+    created = embedded.creation_date
+    modified = embedded.modification_date
+
+    lines = [
+        result.file_name,
+        "EMBEDDED METADATA",
+        f"  Title: {embedded.title or 'Not available'}",
+        f"  Author: {embedded.author or 'Not available'}",
+        f"  Subject: {embedded.subject or 'Not available'}",
+        f"  Creator: {embedded.creator or 'Not available'}",
+        f"  Producer: {embedded.producer or 'Not available'}",
+        f"  Created: {created.date().isoformat() if created else 'Not available'}",
+        f"  Modified: {modified.date().isoformat() if modified else 'Not available'}",
+        f"  Pages: {result.page_count} (analyzed: {result.pages_analyzed})",
+    ]
+
+    if result.ai_generated:
+        ai = result.ai_generated
+        summary_lines = _wrap_text(ai.summary, 60)
+        lines += [
+            "AI-GENERATED (via Gemma)",
+            f"  Summary: {summary_lines[0]}",
+            *(f"           {line}" for line in summary_lines[1:]),
+            f"  Keywords: {' '.join(ai.keywords)}",
+            f"  Category: {ai.category}",
+            f"  Suggested: {ai.suggested_filename}",
+        ]
+
+    file.write("\n".join(lines) + "\n")
+
+
+def _field_text(label: str, value: str | None) -> Text:
+    """Format a field line, marking missing values."""
+    if value:
+        return Text(f"  {label}: {value}")
+    return Text.assemble(f"  {label}: ", _NOT_AVAILABLE)
+
+
+def _display_metadata_tree(result: MetadataResult, console: Console) -> None:
+    """Display metadata result as a Rich Tree.
+
+    Args:
+        result: MetadataResult to display
+        console: Rich console for output
+    """
+    from rich.panel import Panel
+    from rich.tree import Tree
+
+    tree = Tree(Text(result.file_name, style="bold blue"))
 
     # Embedded metadata section
-    embedded_section = tree.add("[bold cyan]EMBEDDED METADATA[/bold cyan]")
+    embedded_section = tree.add(_EMBEDDED_HEADER)
     embedded = result.embedded
+    created = embedded.creation_date
+    modified = embedded.modification_date
 
     _add_field(embedded_section, "Title", embedded.title)
     _add_field(embedded_section, "Author", embedded.author)
     _add_field(embedded_section, "Subject", embedded.subject)
     _add_field(embedded_section, "Creator", embedded.creator)
     _add_field(embedded_section, "Producer", embedded.producer)
+    _add_field(
+        embedded_section, "Created", created.date().isoformat() if created else None
+    )
+    _add_field(
+        embedded_section,
+        "Modified",
+        modified.date().isoformat() if modified else None,
+    )
 
-    if embedded.creation_date:
-        embedded_section.add(f"Created: {embedded.creation_date.strftime('%Y-%m-%d')}")
-    else:
-        embedded_section.add("Created: [dim]Not available[/dim]")
-
-    if embedded.modification_date:
-        embedded_section.add(f"Modified: {embedded.modification_date.strftime('%Y-%m-%d')}")
-    else:
-        embedded_section.add("Modified: [dim]Not available[/dim]")
-
-    embedded_section.add(f"Pages: {result.page_count} (analyzed: {result.pages_analyzed})")
+    embedded_section.add(
+        Text(f"Pages: {result.page_count} (analyzed: {result.pages_analyzed})")
+    )
 
     # AI-generated section
     if result.ai_generated:
-        ai_section = tree.add("[bold magenta]AI-GENERATED (via Gemma)[/bold magenta]")
+        ai_section = tree.add(_AI_HEADER)
         ai = result.ai_generated
 
         # Summary with word wrapping
         summary_lines = _wrap_text(ai.summary, 60)
-        ai_section.add(f"Summary: {summary_lines[0]}")
+        ai_section.add(Text(f"Summary: {summary_lines[0]}"))
         for line in summary_lines[1:]:
-            ai_section.add(f"         {line}")
+            ai_section.add(Text(f"         {line}"))
 
         # Keywords as hashtags
         keywords_str = " ".join(ai.keywords)
-        ai_section.add(f"Keywords: {keywords_str}")
+        ai_section.add(Text(f"Keywords: {keywords_str}"))
 
-        ai_section.add(f"Category: {ai.category}")
-        ai_section.add(f"Suggested: [green]{ai.suggested_filename}[/green]")
+        ai_section.add(Text(f"Category: {ai.category}"))
+        ai_section.add(Text.assemble("Suggested: ", (ai.suggested_filename, "green")))
 
     panel = Panel(
         tree,
-        title="[bold]PDF Metadata[/bold]",
+        title=_PANEL_TITLE,
         border_style="blue",
     )
     console.print(panel)
@@ -71,32 +202,58 @@ def display_metadata(result: MetadataResult, console: Console) -> None:
 def _add_field(tree: Tree, label: str, value: str | None) -> None:
     """Add a field to the tree with proper formatting for None values."""
     if value:
-        tree.add(f"{label}: {value}")
+        tree.add(Text(f"{label}: {value}"))
     else:
-        tree.add(f"{label}: [dim]Not available[/dim]")
+        tree.add(Text.assemble(f"{label}: ", _NOT_AVAILABLE))
 
 
 def _wrap_text(text: str, width: int) -> list[str]:
-    """Wrap text to specified width."""
-    words = text.split()
-    lines: list[str] = []
-    current_line: list[str] = []
-    current_length = 0
+    """Wrap text to specified width, reusing earlier results for repeats."""
+    return list(_wrap_text_cached(text, width))
 
-    for word in words:
-        if current_length + len(word) + 1 <= width:
-            current_line.append(word)
-            current_length += len(word) + 1
-        else:
-            if current_line:
-                lines.append(" ".join(current_line))
-            current_line = [word]
-            current_length = len(word)
 
-    if current_line:
-        lines.append(" ".join(current_line))
+@lru_cache(maxsize=512)
+def _wrap_text_cached(text: str, width: int) -> tuple[str, ...]:
+    """Wrap text to specified width with evenly filled lines.
 
-    return lines if lines else [""]
+    Uses optimal fit rather than greedy filling: among the wrappings with
+    the fewest lines, breaks are chosen to minimise the sum of squared
+    trailing space over all lines except the last. A word longer than the
+    width gets a line of its own.
+    """
+    words = text.split()
+    if not words:
+        return ("",)
+
+    # offsets[i] - offsets[j] - 1 is the length of words[j:i] joined by spaces
+    offsets = list(accumulate((len(word) + 1 for word in words), initial=0))
+
+    # cost[i] is the best (line count, score) for wrapping words[:i]; start[i]
+    # is where the last line of that wrapping begins. Comparing line counts
+    # first keeps the result no taller than greedy filling
+    n = len(words)
+    cost = [(0, 0)] + [(math.inf, math.inf)] * n
+    start = [0] * (n + 1)
+
+    for i in range(1, n + 1):
+        for j in range(i - 1, -1, -1):
+            line_length = offsets[i] - offsets[j] - 1
+            if line_length > width and j < i - 1:
+                break
+            slack = max(width - line_length, 0) if i < n else 0
+            line_cost = (cost[j][0] + 1, cost[j][1] + slack * slack)
+            if line_cost < cost[i]:
+                cost[i] = line_cost
+                start[i] = j
+
+    # Walk the back-pointers to get (start, end) word indices of each line
+    breaks: list[tuple[int, int]] = []
+    i = n
+    while i > 0:
+        breaks.append((start[i], i))
+        i = start[i]
+
+    return tuple(" ".join(words[a:b]) for a, b in reversed(breaks))
 
 
 def display_error(message: str, console: Console) -> None:
@@ -128,7 +285,29 @@ def output_json(result: MetadataResult | BatchResult) -> str:
     Returns:
         JSON string representation
     """
-    return result.model_dump_json(indent=2)
+    return output_json_bytes(result).decode()
+
+
+def output_json_bytes(
+    result: MetadataResult | BatchResult,
+    indent: int | None = 2,
+    exclude: set[str] | None = None,
+) -> bytes:
+    """Convert result to UTF-8 encoded JSON.
+
+    Lets callers write to binary streams without a str round-trip.
+
+    Args:
+        result: MetadataResult or BatchResult to serialize
+        indent: Spaces to indent by, or None for a single line
+        exclude: Top-level fields to leave out
+
+    Returns:
+        JSON bytes representation
+    """
+    return _JSON_ADAPTERS[type(result)].dump_json(
+        result, indent=indent, exclude=exclude
+    )
 
 
 @contextmanager
@@ -141,6 +320,8 @@ def create_spinner(description: str) -> Generator[Progress, None, None]:
     Yields:
         Progress context manager
     """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
     progress = Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -151,8 +332,23 @@ def create_spinner(description: str) -> Generator[Progress, None, None]:
         yield progress
 
 
+class _NullProgress:
+    """Stand-in for Progress in quiet mode; every method does nothing."""
+
+    def add_task(self, *args, **kwargs) -> int:
+        return 0
+
+    def update(self, *args, **kwargs) -> None:
+        pass
+
+    def advance(self, *args, **kwargs) -> None:
+        pass
+
+
 @contextmanager
-def create_batch_progress(total: int, quiet: bool = False) -> Generator[Progress, None, None]:
+def create_batch_progress(
+    total: int, quiet: bool = False
+) -> Generator[Progress | _NullProgress, None, None]:
     """Create a progress bar for batch processing.
 
     Args:
@@ -163,19 +359,25 @@ def create_batch_progress(total: int, quiet: bool = False) -> Generator[Progress
         Progress context manager
     """
     if quiet:
-        # Create a silent progress that does nothing
-        progress = Progress(
-            TextColumn(""),
-            transient=True,
-        )
-    else:
-        progress = Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            transient=True,
-        )
+        # Skip Rich entirely so no live display or refresh thread is started
+        yield _NullProgress()
+        return
+
+    from rich.progress import (
+        BarColumn,
+        Progress,
+        SpinnerColumn,
+        TaskProgressColumn,
+        TextColumn,
+    )
+
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        transient=True,
+    )
 
     with progress:
         yield progress
@@ -188,34 +390,84 @@ def display_batch_result(result: BatchResult, console: Console) -> None:
         result: BatchResult to display
         console: Rich console for output
     """
+    if not console.is_terminal:
+        _plain_batch_result(result, console.file)
+        return
+
+    from rich.panel import Panel
+    from rich.table import Table
+
     # Summary panel
     summary = f"""[bold]Batch Processing Complete[/bold]
 
-Directory: {result.directory}
+Directory: {escape(str(result.directory))}
 Total files: {result.total_files}
 [green]Successful: {result.successful}[/green]
 [red]Failed: {result.failed}[/red]
 """
 
-    console.print(Panel(summary, title="Summary", border_style="blue"))
+    # Rich buffers output inside the console context and writes it all at
+    # once on exit, instead of one write per print
+    with console:
+        console.print(Panel(summary, title="Summary", border_style="blue"))
+
+        # Individual results
+        if result.results:
+            table = Table(title="Results", title_style="bold", header_style="bold")
+            table.add_column("File", style="green")
+            table.add_column("Title")
+            table.add_column("Author")
+            table.add_column("Category")
+            table.add_column("Suggested", overflow="fold")
+            # Cells are Text so names like "[draft].pdf" are not read as markup
+            for r in result.results:
+                ai = r.ai_generated
+                table.add_row(
+                    Text(r.file_name),
+                    Text(r.embedded.title or r.file_name),
+                    Text(r.embedded.author or "Unknown"),
+                    Text(ai.category if ai else ""),
+                    Text(ai.suggested_filename if ai else ""),
+                )
+            console.print(table)
+
+        # Errors
+        if result.errors:
+            table = Table(title="Errors", title_style="bold red", header_style="bold")
+            table.add_column("File", style="red")
+            table.add_column("Error")
+            for err in result.errors:
+                table.add_row(Text(err["file"]), Text(err["error"]))
+            console.print(table)
+
+
+def _plain_batch_result(result: BatchResult, file: IO[str]) -> None:
+    """Write batch result as plain text, for output that is not a terminal."""
+    lines = [
+        "Batch Processing Complete",
+        f"Directory: {result.directory}",
+        f"Total files: {result.total_files}",
+        f"Successful: {result.successful}",
+        f"Failed: {result.failed}",
+    ]
 
-    # Individual results
     if result.results:
-        console.print("\n[bold]Results:[/bold]\n")
-        for r in result.results:
-            title = r.embedded.title or r.file_name
-            author = r.embedded.author or "Unknown"
-            console.print(f"  [green]✓[/green] {r.file_name}")
-            console.print(f"      Title: {title}")
-            console.print(f"      Author: {author}")
-            if r.ai_generated:
-                console.print(f"      Category: {r.ai_generated.category}")
-                console.print(f"      Suggested: {r.ai_generated.suggested_filename}")
-            console.print()
-
-    # Errors
+        blocks = [
+            f"  ✓ {r.file_name}\n"
+            f"      Title: {r.embedded.title or r.file_name}\n"
+            f"      Author: {r.embedded.author or 'Unknown'}"
+            + (
+                f"\n      Category: {r.ai_generated.category}"
+                f"\n      Suggested: {r.ai_generated.suggested_filename}"
+                if r.ai_generated
+                else ""
+            )
+            for r in result.results
+        ]
+        lines += ["", "Results:", "\n\n".join(blocks)]
+
     if result.errors:
-        console.print("\n[bold red]Errors:[/bold red]\n")
-        for err in result.errors:
-            console.print(f"  [red]✗[/red] {err['file']}")
-            console.print(f"      {err['error']}")
+        blocks = [f"  ✗ {err['file']}\n      {err['error']}" for err in result.errors]
+        lines += ["", "Errors:", "\n".join(blocks)]
+
+    file.write("\n".join(lines) + "\n")
@@ -1,12 +1,99 @@
 """PDF extraction service using pypdf."""
 
+import logging
+import mmap
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+from operator import itemgetter
 from pathlib import Path
+from typing import TYPE_CHECKING, Generator, Mapping
 
-from pypdf import PdfReader
+from pypdf import DocumentInformation, PdfReader
 from pypdf.errors import PdfReadError
+from pypdf.generic import DictionaryObject, read_object
 
 from docinfer.models.metadata import EmbeddedMetadata
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from docinfer.models.config import ExtractionConfig, OutputConfig
+    from docinfer.models.metadata import BatchResult, MetadataResult
+
+logger = logging.getLogger(__name__)
+
+# Texts are grouped into length bins of this many characters before AI
+# dispatch; everything past the last bin is truncated by the analyzer anyway
+LENGTH_BIN_CHARS = 1024
+MAX_LENGTH_BIN = 8
+
+# Document information keys to try for each metadata field, in order
+_METADATA_KEYS = {
+    field: (f"/{field.capitalize()}", f"/{field}", field)
+    for field in ("title", "author", "subject", "creator", "producer")
+}
+
+# Fast-path trailer scan (see _fast_trailer_metadata)
+_TAIL_BYTES = 2048
+_XREF_ENTRY_BYTES = 20
+_MAX_XREF_SECTIONS = 32
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_XREF_SUBSECTION_RE = re.compile(rb"\s*(\d+)[ \t]+(\d+)[ \t]*\r?\n")
+_XREF_ENTRY_RE = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_TRAILER_RE = re.compile(rb"\s*trailer\s*")
+_OBJ_HEADER_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\s*")
+_INDIRECT_REF_RE = re.compile(rb"\d+\s+\d+\s+R\b")
+_PREV_RE = re.compile(rb"/Prev\s+(\d+)")
+_INFO_RE = re.compile(rb"/Info\s+(\d+)\s+(\d+)\s+R")
+_ROOT_RE = re.compile(rb"/Root\s+(\d+)\s+(\d+)\s+R")
+_PAGES_RE = re.compile(rb"/Pages\s+(\d+)\s+(\d+)\s+R")
+# A direct count only; "/Count 11 0 R" would otherwise read 11 as the count
+_COUNT_RE = re.compile(rb"/Count\s+(\d+)\b(?!\s+\d+\s+R)")
+
+
+def extract_all(
+    file_path: Path, max_pages: int = 10, max_chars: int | None = None
+) -> tuple[EmbeddedMetadata, int, list[str], str, int]:
+    """Extract embedded metadata and text from a PDF, parsing it only once.
+
+    Args:
+        file_path: Path to the PDF file
+        max_pages: Maximum number of pages to extract text from (0 skips text)
+        max_chars: Stop reading pages once this much text is collected
+
+    Returns:
+        Tuple of (EmbeddedMetadata, page_count, warnings, text, pages_analyzed)
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        PermissionError: If file can't be read
+        ValueError: If file is encrypted or corrupted
+    """
+    if not max_pages:
+        # Metadata only, which the trailer fast path can usually provide
+        embedded, page_count, warnings = extract_embedded_metadata(file_path)
+        return embedded, page_count, warnings, "", 0
+
+    with _open_pdf(file_path) as reader:
+        embedded, page_count, warnings = _extract_embedded_from_reader(reader)
+
+        text_content = ""
+        pages_analyzed = 0
+        try:
+            text_content, pages_analyzed = _extract_text_from_reader(
+                reader, max_pages, max_chars
+            )
+        except Exception as e:
+            warnings.append(f"Text extraction failed: {e}")
+
+    return embedded, page_count, warnings, text_content, pages_analyzed
+
 
 def extract_embedded_metadata(
     file_path: Path,
@@ -24,16 +111,72 @@ def extract_embedded_metadata(
         PermissionError: If file can't be read
         ValueError: If file is encrypted or corrupted
     """
+    fast = _fast_trailer_metadata(file_path)
+    if fast is not None:
+        info, page_count = fast
+        embedded, warnings = _embedded_from_info(info)
+        return embedded, page_count, warnings
+
+    with _open_pdf(file_path) as reader:
+        return _extract_embedded_from_reader(reader)
+
+
+def extract_text(
+    file_path: Path, max_pages: int = 10, max_chars: int | None = None
+) -> tuple[str, int]:
+    """Extract text content from the first N pages of a PDF.
+
+    Args:
+        file_path: Path to the PDF file
+        max_pages: Maximum number of pages to extract (default 10)
+        max_chars: Stop reading pages once this much text is collected
+
+    Returns:
+        Tuple of (extracted_text, pages_analyzed)
+    """
+    with _open_pdf(file_path) as reader:
+        return _extract_text_from_reader(reader, max_pages, max_chars)
+
+
+@contextmanager
+def _open_pdf(file_path: Path) -> Generator[PdfReader, None, None]:
+    """Open a memory-mapped PDF for reading, translating pypdf errors.
+
+    pypdf reads a path fully into memory; handing it the mapping instead
+    lets it read straight from the OS page cache.
+    """
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    warnings: list[str] = []
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Invalid or corrupted PDF: Cannot read an empty file")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
     try:
-        reader = PdfReader(file_path)
-    except PdfReadError as e:
-        raise ValueError(f"Invalid or corrupted PDF: {e}")
+        try:
+            reader = PdfReader(mm)
+        except PdfReadError as e:
+            raise ValueError(f"Invalid or corrupted PDF: {e}")
+        yield reader
+    finally:
+        mm.close()
+
+
+def _extract_embedded_from_reader(
+    reader: PdfReader,
+) -> tuple[EmbeddedMetadata, int, list[str]]:
+    """Extract embedded metadata from an open PDF.
+
+    Args:
+        reader: Open PDF reader
+
+    Returns:
+        Tuple of (EmbeddedMetadata, page_count, warnings)
 
+    Raises:
+        ValueError: If file is encrypted
+    """
     # Check for encryption
     if reader.is_encrypted:
         raise ValueError("PDF is password-protected and cannot be read")
@@ -42,26 +185,23 @@ def extract_embedded_metadata(
     page_count = len(reader.pages)
 
     # Extract metadata
-    metadata = reader.metadata or {}
+    embedded, warnings = _embedded_from_info(reader.metadata or {})
+
+    return embedded, page_count, warnings
 
-    # Helper function to safely extract metadata field
-    def get_metadata_field(key: str) -> str | None:
-        """Safely extract metadata field using both attribute and dict access."""
-        try:
-            # Try attribute access first
-            if hasattr(metadata, key):
-                value = getattr(metadata, key)
-                if value:
-                    return str(value).strip() if value else None
-            # Try dict-like access with common key variations
-            for variant in [f"/{key}", f"/{key.capitalize()}", key]:
-                if variant in metadata:
-                    value = metadata[variant]
-                    if value:
-                        return str(value).strip() if value else None
-            return None
-        except Exception:
-            return None
+
+def _embedded_from_info(
+    metadata: Mapping,
+) -> tuple[EmbeddedMetadata, list[str]]:
+    """Build EmbeddedMetadata from a PDF document information dictionary.
+
+    Args:
+        metadata: Document information (pypdf DocumentInformation or dict)
+
+    Returns:
+        Tuple of (EmbeddedMetadata, warnings)
+    """
+    warnings: list[str] = []
 
     # Parse creation date
     creation_date = None
@@ -83,44 +223,208 @@ def extract_embedded_metadata(
     except Exception:
         warnings.append("Could not parse modification date")
 
-    embedded = EmbeddedMetadata(
-        title=get_metadata_field("title"),
-        author=get_metadata_field("author"),
-        subject=get_metadata_field("subject"),
-        creator=get_metadata_field("creator"),
-        producer=get_metadata_field("producer"),
+    # EmbeddedMetadata is built without validation, so only pass real dates
+    if creation_date is not None and not isinstance(creation_date, datetime):
+        warnings.append("Could not parse creation date")
+        creation_date = None
+    if modification_date is not None and not isinstance(modification_date, datetime):
+        warnings.append("Could not parse modification date")
+        modification_date = None
+
+    embedded = EmbeddedMetadata.model_construct(
+        title=_get_metadata_field(metadata, "title"),
+        author=_get_metadata_field(metadata, "author"),
+        subject=_get_metadata_field(metadata, "subject"),
+        creator=_get_metadata_field(metadata, "creator"),
+        producer=_get_metadata_field(metadata, "producer"),
         creation_date=creation_date,
         modification_date=modification_date,
     )
 
-    return embedded, page_count, warnings
+    return embedded, warnings
 
 
-def extract_text(file_path: Path, max_pages: int = 10) -> tuple[str, int]:
-    """Extract text content from the first N pages of a PDF.
+def _get_metadata_field(metadata: Mapping, field: str) -> str | None:
+    """Safely extract a document information field as a stripped string."""
+    try:
+        for key in _METADATA_KEYS[field]:
+            # Subscript rather than .get() so pypdf resolves indirect objects
+            if key in metadata:
+                value = metadata[key]
+                if value:
+                    return str(value).strip()
+        return None
+    except Exception:
+        return None
+
+
+def _fast_trailer_metadata(
+    file_path: Path,
+) -> tuple[DocumentInformation, int] | None:
+    """Read the document info and page count without fully parsing the PDF.
+
+    Finds startxref in the last few KiB of the file, looks up the Info,
+    Root and Pages objects through the classic xref table(s), and reads
+    only those objects. Anything unusual (xref streams, encryption,
+    indirect values in the Info dictionary, malformed tables) returns None
+    so the caller can fall back to a full PdfReader parse.
 
     Args:
         file_path: Path to the PDF file
-        max_pages: Maximum number of pages to extract (default 10)
 
     Returns:
-        Tuple of (extracted_text, pages_analyzed)
+        Tuple of (DocumentInformation, page_count), or None
+    """
+    try:
+        with open(file_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return _parse_trailer_metadata(data)
+    except Exception:
+        return None
+
+
+def _parse_trailer_metadata(
+    data: mmap.mmap,
+) -> tuple[DocumentInformation, int] | None:
+    """Parse the document info and page count from a mapped PDF."""
+    startxref = None
+    for startxref in _STARTXREF_RE.finditer(data, max(len(data) - _TAIL_BYTES, 0)):
+        pass
+    if startxref is None:
+        return None
+
+    # Walk the xref sections from newest to oldest via /Prev
+    sections: list[list[tuple[int, int, int]]] = []
+    trailer: bytes | None = None
+    xref_pos: int | None = int(startxref.group(1))
+    while xref_pos is not None:
+        if len(sections) == _MAX_XREF_SECTIONS:
+            return None
+        section = _read_xref_section(data, xref_pos)
+        if section is None:
+            return None
+        subsections, section_trailer = section
+        sections.append(subsections)
+        if trailer is None:
+            trailer = section_trailer
+        prev = _PREV_RE.search(section_trailer)
+        xref_pos = int(prev.group(1)) if prev else None
+
+    if b"/Encrypt" in trailer or b"/XRefStm" in trailer:
+        return None
+
+    # Page count from the root of the page tree
+    catalog = _read_indirect(data, sections, _ROOT_RE.search(trailer))
+    pages = _read_indirect(data, sections, _PAGES_RE.search(catalog or b""))
+    count = _COUNT_RE.search(pages or b"")
+    if count is None:
+        return None
+
+    info = DocumentInformation()
+    info_ref = _INFO_RE.search(trailer)
+    if info_ref is not None:
+        info_body = _read_indirect(data, sections, info_ref)
+        if info_body is None or _INDIRECT_REF_RE.search(info_body):
+            return None
+        info_dict = read_object(BytesIO(info_body), None)
+        if not isinstance(info_dict, DictionaryObject):
+            return None
+        info.update(info_dict)
+
+    return info, int(count.group(1))
+
+
+def _read_xref_section(
+    data: mmap.mmap, pos: int
+) -> tuple[list[tuple[int, int, int]], bytes] | None:
+    """Read the subsection headers and trailer of a classic xref table.
+
+    Returns:
+        Tuple of ([(first_object, count, entries_offset), ...], trailer), or
+        None if there is no xref table at pos (e.g. an xref stream)
     """
-    reader = PdfReader(file_path)
+    if data[pos : pos + 4] != b"xref":
+        return None
+    pos += 4
+
+    subsections: list[tuple[int, int, int]] = []
+    while header := _XREF_SUBSECTION_RE.match(data, pos):
+        first, count = int(header.group(1)), int(header.group(2))
+        subsections.append((first, count, header.end()))
+        pos = header.end() + count * _XREF_ENTRY_BYTES
+
+    trailer = _TRAILER_RE.match(data, pos)
+    if trailer is None:
+        return None
+    end = data.find(b"startxref", trailer.end())
+    if end == -1:
+        return None
+    return subsections, data[trailer.end() : end]
+
+
+def _read_indirect(
+    data: mmap.mmap,
+    sections: list[list[tuple[int, int, int]]],
+    ref: re.Match | None,
+) -> bytes | None:
+    """Return the body of the object referenced by an "n g R" match."""
+    if ref is None:
+        return None
+    number, generation = int(ref.group(1)), int(ref.group(2))
+
+    # Newer sections take precedence; entries are fixed-width, so the one
+    # for an object can be read directly without scanning the table
+    for subsections in sections:
+        for first, count, entries in subsections:
+            if not first <= number < first + count:
+                continue
+            entry_pos = entries + (number - first) * _XREF_ENTRY_BYTES
+            entry = _XREF_ENTRY_RE.match(data, entry_pos)
+            if entry is None or entry.group(3) != b"n":
+                return None
+
+            header = _OBJ_HEADER_RE.match(data, int(entry.group(1)))
+            if header is None:
+                return None
+            if (int(header.group(1)), int(header.group(2))) != (number, generation):
+                return None
+            end = data.find(b"endobj", header.end())
+            return data[header.end() : end] if end != -1 else None
+
+    return None
+
+
+def _extract_text_from_reader(
+    reader: PdfReader, max_pages: int, max_chars: int | None = None
+) -> tuple[str, int]:
+    """Extract text content from the first N pages of an open PDF.
+
+    Args:
+        reader: Open PDF reader
+        max_pages: Maximum number of pages to extract
+        max_chars: Stop reading pages once this much text is collected
 
+    Returns:
+        Tuple of (extracted_text, pages_analyzed)
+    """
     if reader.is_encrypted:
         return "", 0
 
     pages_to_read = min(len(reader.pages), max_pages)
     text_parts: list[str] = []
+    total_chars = 0
+    pages_analyzed = 0
 
     for i in range(pages_to_read):
-        page = reader.pages[i]
-        page_text = page.extract_text() or ""
+        page_text = reader.pages[i].extract_text() or ""
+        pages_analyzed += 1
         if page_text.strip():
             text_parts.append(page_text)
+            total_chars += len(page_text)
+            if max_chars is not None and total_chars >= max_chars:
+                break
 
-    return "\n\n".join(text_parts), pages_to_read
+    return "\n\n".join(text_parts), pages_analyzed
 
 
 def find_pdfs(directory: Path) -> list[Path]:
@@ -132,8 +436,22 @@ def find_pdfs(directory: Path) -> list[Path]:
     Returns:
         List of PDF file paths, sorted by name
     """
-    pdf_files = list(directory.glob("*.pdf"))
-    return sorted(pdf_files, key=lambda p: p.name.lower())
+    # The directory's mtime changes whenever entries are added or removed
+    return list(_scan_pdfs(str(directory), directory.stat().st_mtime_ns))
+
+
+@lru_cache(maxsize=8)
+def _scan_pdfs(directory: str, mtime_ns: int) -> tuple[Path, ...]:
+    """List PDF files in a directory; cached per directory and mtime."""
+    entries: list[tuple[str, str]] = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            sort_key = entry.name.lower()
+            if sort_key.endswith(".pdf") and entry.is_file():
+                entries.append((sort_key, entry.path))
+
+    entries.sort(key=itemgetter(0))
+    return tuple(Path(path) for _, path in entries)
 
 
 def process_directory(
@@ -155,74 +473,161 @@ def process_directory(
     Returns:
         BatchResult with all processing results
     """
-    from docinfer.models.config import ExtractionConfig, OutputConfig
-    from docinfer.models.metadata import BatchResult, MetadataResult
+    from docinfer.models.metadata import BatchResult
+
+    errors: list[dict] = []
+    results = list(
+        process_directory_stream(
+            pdf_files, extraction_config, output_config, console, errors
+        )
+    )
+
+    # Results stream out as they finish; report them in the original file order
+    order = {pdf_file: i for i, pdf_file in enumerate(pdf_files)}
+    results.sort(key=lambda r: order[r.file_path])
+    errors.sort(key=lambda e: order[Path(e["file"])])
+
+    return BatchResult(
+        directory=directory,
+        total_files=len(pdf_files),
+        successful=len(results),
+        failed=len(errors),
+        results=results,
+        errors=errors,
+    )
+
+
+def process_directory_stream(
+    pdf_files: list[Path],
+    extraction_config: "ExtractionConfig",
+    output_config: "OutputConfig",
+    console: "Console",
+    errors: list[dict],
+) -> Generator["MetadataResult", None, None]:
+    """Process PDFs, yielding each result as soon as it is complete.
+
+    Results are yielded in completion order, so a caller can write them out
+    without holding the whole batch in memory.
+
+    Args:
+        pdf_files: List of PDF files to process
+        extraction_config: Extraction configuration
+        output_config: Output configuration
+        console: Rich console for output
+        errors: List that files failing to process are appended to
+
+    Yields:
+        MetadataResult for each successfully processed file
+    """
+    from docinfer.models.metadata import MetadataResult
     from docinfer.services.ai_analyzer import (
-        analyze_content,
+        OLLAMA_NUM_PARALLEL,
+        analyze_contents,
         is_ollama_available,
         merge_ai_into_embedded,
+        warm_up_model,
     )
     from docinfer.services.output import create_batch_progress
 
-    results: list[MetadataResult] = []
-    errors: list[dict] = []
-
     # Check AI availability once
     ai_available = False
     if not extraction_config.skip_ai:
         ai_available = is_ollama_available(extraction_config.model_name)
 
-    with create_batch_progress(len(pdf_files), output_config.quiet) as progress:
-        task = progress.add_task("Processing PDFs...", total=len(pdf_files))
-
-        for pdf_file in pdf_files:
-            try:
-                # Extract embedded metadata
-                embedded, page_count, warnings = extract_embedded_metadata(pdf_file)
-
-                # Extract text
-                text_content = ""
-                pages_analyzed = 0
-                if not extraction_config.skip_ai and ai_available:
-                    text_content, pages_analyzed = extract_text(
-                        pdf_file, extraction_config.max_pages
+    # Only extract text when it will be sent to the AI
+    max_pages = extraction_config.max_pages if ai_available else 0
+
+    # Documents waiting for AI analysis, binned by text length so each batch
+    # holds documents of similar size
+    bins: dict[int, list[tuple[MetadataResult, str]]] = defaultdict(list)
+
+    def analyze_bins(bin_indexes: list[int]) -> list[MetadataResult]:
+        batch = []
+        for bin_index in bin_indexes:
+            batch.extend(bins.pop(bin_index))
+        texts = [text_content for _, text_content in batch]
+        logger.debug(
+            "AI bins %s: %d documents, ~%d tokens",
+            bin_indexes,
+            len(batch),
+            sum(len(text) for text in texts) // 4,
+        )
+        ai_results = analyze_contents(texts, extraction_config)
+
+        for (result, _), ai_metadata in zip(batch, ai_results):
+            if ai_metadata:
+                result.ai_generated = ai_metadata
+                # Merge AI-extracted data into embedded metadata
+                result.embedded = merge_ai_into_embedded(result.embedded, ai_metadata)
+
+        progress.update(task, advance=len(batch))
+        return [result for result, _ in batch]
+
+    if not pdf_files:
+        return
+
+    # pypdf is CPU-bound and not thread-safe, so parse PDFs in worker
+    # processes; AI analysis stays here since it talks to one Ollama server.
+    # Workers are started before the warm-up and progress threads, since
+    # forking a multi-threaded process can deadlock the child
+    max_workers = min(len(pdf_files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                extract_all, pdf_file, max_pages, extraction_config.max_chars
+            ): pdf_file
+            for pdf_file in pdf_files
+        }
+
+        # Load the model while PDFs are parsed so the first AI request does
+        # not wait for it; its thread starts only once the workers exist
+        if ai_available:
+            warm_up_model(extraction_config.model_name)
+
+        with create_batch_progress(len(pdf_files), output_config.quiet) as progress:
+            task = progress.add_task("Processing PDFs...", total=len(pdf_files))
+
+            for future in as_completed(futures):
+                # Drop the finished future so its result (text included) is
+                # freed once yielded, instead of when the whole batch ends
+                pdf_file = futures.pop(future)
+                try:
+                    embedded, page_count, warnings, text_content, pages_analyzed = (
+                        future.result()
                     )
-                    if not text_content.strip():
-                        warnings.append("No extractable text found")
+                except Exception as e:
+                    errors.append({"file": str(pdf_file), "error": str(e)})
+                    progress.update(task, advance=1)
+                    continue
 
-                # AI analysis
-                ai_metadata = None
-                if ai_available and text_content.strip():
-                    ai_metadata = analyze_content(text_content, extraction_config)
+                if pages_analyzed and not text_content.strip():
+                    warnings.append("No extractable text found")
 
-                result = MetadataResult(
+                # Values come from our own extraction, so skip validation
+                result = MetadataResult.model_construct(
                     file_path=pdf_file,
                     file_name=pdf_file.name,
                     page_count=page_count,
                     pages_analyzed=pages_analyzed,
                     embedded=embedded,
-                    ai_generated=ai_metadata,
+                    ai_generated=None,
                     warnings=warnings,
                 )
 
-                # Merge AI-extracted data into embedded metadata for missing fields
-                if ai_metadata:
-                    result.embedded = merge_ai_into_embedded(
-                        result.embedded, ai_metadata
-                    )
-
-                results.append(result)
-
-            except Exception as e:
-                errors.append({"file": str(pdf_file), "error": str(e)})
-
-            progress.update(task, advance=1)
-
-    return BatchResult(
-        directory=directory,
-        total_files=len(pdf_files),
-        successful=len(results),
-        failed=len(errors),
-        results=results,
-        errors=errors,
-    )
+                if not (ai_available and text_content.strip()):
+                    progress.update(task, advance=1)
+                    yield result
+                    continue
+
+                # Send a bin to the AI once it fills the server's parallel
+                # slots; parsing carries on in the workers meanwhile
+                bin_index = min(len(text_content) // LENGTH_BIN_CHARS, MAX_LENGTH_BIN)
+                bins[bin_index].append((result, text_content))
+                if len(bins[bin_index]) >= OLLAMA_NUM_PARALLEL:
+                    yield from analyze_bins([bin_index])
+
+            # Analyze the partly filled bins left over in one batch; the
+            # analyzer dispatches by length, so similar sizes still share slots
+            if bins:
+                progress.update(task, description="Analyzing with AI...")
+                yield from analyze_bins(sorted(bins))
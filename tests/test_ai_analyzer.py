@@ -0,0 +1,104 @@
+"""Tests for docinfer.services.ai_analyzer."""
+
+import pytest
+
+from docinfer.models.metadata import AIMetadata, EmbeddedMetadata
+from docinfer.services.ai_analyzer import (
+    MAX_CHARS,
+    _num_parallel,
+    _truncate,
+    merge_ai_into_embedded,
+)
+
+TRUNCATED = "\n\n[Text truncated...]"
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("2", 2), ("0", 1), ("-3", 1), ("auto", 4), ("", 4)],
+)
+def test_num_parallel_is_a_positive_integer(monkeypatch, value, expected):
+    monkeypatch.setenv("DOCINFER_NUM_PARALLEL", value)
+
+    assert _num_parallel() == expected
+
+
+def test_num_parallel_defaults_when_unset(monkeypatch):
+    monkeypatch.delenv("DOCINFER_NUM_PARALLEL", raising=False)
+
+    assert _num_parallel() == 4
+
+
+def test_truncate_leaves_short_text_alone():
+    text = "x" * MAX_CHARS
+
+    assert _truncate(text) == text
+
+
+def test_truncate_cuts_at_last_paragraph_break():
+    text = "a" * 5000 + "\n\n" + "b" * 2000 + "\n\n" + "c" * 2000
+
+    assert _truncate(text) == "a" * 5000 + "\n\n" + "b" * 2000 + TRUNCATED
+
+
+def test_truncate_falls_back_to_sentence_and_keeps_full_stop():
+    text = "a" * 6000 + ". " + "b" * 3000
+
+    assert _truncate(text) == "a" * 6000 + "." + TRUNCATED
+
+
+def test_truncate_ignores_boundaries_in_first_half():
+    # A break before MAX_CHARS // 2 would throw away too much text
+    text = "a" * 100 + "\n\n" + "b" * 9000
+
+    assert _truncate(text) == text[:MAX_CHARS] + TRUNCATED
+
+
+def _merge(suggested_filename, embedded=None):
+    ai = AIMetadata(
+        summary="A document.",
+        keywords=["#a", "#b", "#c"],
+        category="statistics",
+        suggested_filename=suggested_filename,
+    )
+    return merge_ai_into_embedded(embedded or EmbeddedMetadata(), ai)
+
+
+@pytest.mark.parametrize(
+    ("filename", "title", "author"),
+    [
+        ("topic-title-author-2020.pdf", "Topic Title", "author"),
+        (
+            "stats-bayesian-data-analysis-gelman-2013.pdf",
+            "Stats Bayesian Data Analysis",
+            "gelman",
+        ),
+        ("topic-title-smith-unknown.pdf", "Topic Title", "smith"),
+        ("topic-title-unknown-2020.pdf", "Topic Title", None),
+        ("topic-title-unknown-unknown.pdf", "Topic Title", None),
+        ("topic-title.pdf", "Topic Title", None),
+        ("Topic-Title-Author-2020.pdf", "Topic Title", "author"),
+    ],
+)
+def test_merge_reads_title_and_author_from_filename(filename, title, author):
+    merged = _merge(filename)
+
+    assert merged.title == title
+    assert merged.author == author
+    assert merged.subject == "statistics"
+
+
+def test_merge_keeps_embedded_fields():
+    embedded = EmbeddedMetadata(title="Real Title", author="Real Author")
+
+    merged = _merge("topic-title-author-2020.pdf", embedded)
+
+    assert merged.title == "Real Title"
+    assert merged.author == "Real Author"
+
+
+def test_merge_without_pdf_extension_extracts_nothing():
+    merged = _merge("topic-title-author-2020")
+
+    assert merged.title is None
+    assert merged.author is None
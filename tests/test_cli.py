@@ -0,0 +1,41 @@
+"""Tests for docinfer.cli."""
+
+import json
+
+from pypdf import PdfWriter
+
+from docinfer.cli import _process_directory
+from docinfer.models import ExtractionConfig, MetadataResult, OutputConfig
+
+
+def test_directory_export_writes_json_lines(tmp_path, capsysbinary):
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    writer = PdfWriter()
+    writer.add_blank_page(612, 792)
+    writer.add_metadata({"/Title": "Valid"})
+    writer.write(pdf_dir / "valid.pdf")
+    (pdf_dir / "corrupt.pdf").write_bytes(b"%PDF-1.4\nnot a pdf")
+    export_path = tmp_path / "out.jsonl"
+
+    _process_directory(
+        pdf_dir,
+        ExtractionConfig(skip_ai=True),
+        OutputConfig(json_output=True, export_path=export_path, quiet=True),
+    )
+
+    records = [json.loads(line) for line in export_path.read_text().splitlines()]
+    results = [r for r in records if r.get("type") != "error"]
+    errors = [r for r in records if r.get("type") == "error"]
+    assert len(results) == 1
+    assert MetadataResult.model_validate(results[0]).embedded.title == "Valid"
+    assert len(errors) == 1
+    assert errors[0]["file"] == str(pdf_dir / "corrupt.pdf")
+    assert errors[0]["error"]
+
+    summary = json.loads(capsysbinary.readouterr().out)
+    assert "results" not in summary
+    assert summary["total_files"] == 2
+    assert summary["successful"] == 1
+    assert summary["failed"] == 1
+    assert summary["errors"][0]["file"] == str(pdf_dir / "corrupt.pdf")
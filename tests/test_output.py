@@ -0,0 +1,85 @@
+"""Tests for docinfer.services.output."""
+
+import random
+import textwrap
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from docinfer.models.metadata import AIMetadata, EmbeddedMetadata, MetadataResult
+from docinfer.services.output import _wrap_text, display_metadata
+
+
+def _greedy(text, width):
+    return textwrap.wrap(
+        text, width, break_long_words=False, break_on_hyphens=False
+    ) or [""]
+
+
+@pytest.mark.parametrize("text", ["", "   ", "\n\t"])
+def test_wrap_empty_text_gives_one_empty_line(text):
+    assert _wrap_text(text, 10) == [""]
+
+
+def test_wrap_short_text_fits_on_one_line():
+    assert _wrap_text("a short summary", 60) == ["a short summary"]
+
+
+def test_wrap_long_word_gets_its_own_line():
+    assert _wrap_text("a verylongword b", 5) == ["a", "verylongword", "b"]
+
+
+def test_wrap_balances_lines_instead_of_filling_greedily():
+    # Greedy gives "aaa bb" / "cc" / "ddddd"
+    assert _wrap_text("aaa bb cc ddddd", 6) == ["aaa", "bb cc", "ddddd"]
+
+
+def test_wrap_last_line_space_is_free():
+    # Evening out "aaa bbb" / "ccc d" would only shorten the last line
+    assert _wrap_text("aaa bbb ccc d", 11) == ["aaa bbb ccc", "d"]
+
+
+def test_wrap_never_uses_more_lines_than_greedy():
+    rng = random.Random(0)
+    for _ in range(2000):
+        words = ["x" * rng.randint(1, 9) for _ in range(rng.randint(1, 14))]
+        width = rng.randint(5, 20)
+        text = " ".join(words)
+
+        lines = _wrap_text(text, width)
+
+        assert " ".join(lines).split() == words
+        assert all(len(line) <= width for line in lines if " " in line)
+        assert len(lines) <= len(_greedy(text, width))
+
+
+def test_wrap_matches_greedy_line_count_where_squares_alone_would_not():
+    text = "xxxx x xxxxxx xxxx xxxx xxxx xxxxxxx xxxxxxx xxxxxx x xxxxxxxx xx xx"
+
+    assert len(_wrap_text(text, 15)) == len(_greedy(text, 15)) == 5
+
+
+def test_display_metadata_shows_brackets_literally():
+    result = MetadataResult(
+        file_path=Path("[draft].pdf"),
+        file_name="[draft].pdf",
+        page_count=1,
+        pages_analyzed=1,
+        embedded=EmbeddedMetadata(title="Notes [/x]"),
+        ai_generated=AIMetadata(
+            summary="A [bold] summary.",
+            keywords=["#a", "#b", "#c"],
+            category="misc",
+            suggested_filename="misc-notes-[v2]-unknown-unknown.pdf",
+        ),
+    )
+    console = Console(force_terminal=True, width=100, color_system=None)
+
+    with console.capture() as capture:
+        display_metadata(result, console)
+    output = capture.get()
+
+    for text in ("[draft].pdf", "Notes [/x]", "A [bold] summary.", "-[v2]-"):
+        assert text in output
+    assert "Author: Not available" in output
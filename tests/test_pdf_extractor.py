@@ -0,0 +1,217 @@
+"""Tests for docinfer.services.pdf_extractor."""
+
+import gc
+import weakref
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import pytest
+from pypdf import PdfWriter
+from rich.console import Console
+
+from docinfer.models import ExtractionConfig, OutputConfig
+from docinfer.services import pdf_extractor
+from docinfer.services.pdf_extractor import (
+    _extract_embedded_from_reader,
+    _fast_trailer_metadata,
+    _open_pdf,
+    extract_embedded_metadata,
+    process_directory,
+    process_directory_stream,
+)
+
+INFO = b"<< /Title (Fast Path) /Author (Jane Roe) /CreationDate (D:20210504120000Z) >>"
+
+
+def _objects(page_count=2, count=None, info=INFO):
+    """Catalog, page tree, pages and info dictionary, keyed by object number."""
+    kids = b" ".join(b"%d 0 R" % (10 + i) for i in range(page_count))
+    count = count if count is not None else b"%d" % page_count
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [" + kids + b"] /Count " + count + b" >>",
+        3: info,
+    }
+    for i in range(page_count):
+        objects[10 + i] = b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>"
+    return objects
+
+
+def _body(data, objects):
+    """Append objects to data, returning the new data and their offsets."""
+    offsets = {}
+    for number, body in sorted(objects.items()):
+        offsets[number] = len(data)
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    return data, offsets
+
+
+def _xref_table(offsets):
+    """Classic xref table with one subsection per object."""
+    table = b"xref\n"
+    for number, offset in sorted(offsets.items()):
+        table += b"%d 1\n%010d 00000 n \n" % (number, offset)
+    return table
+
+
+def _classic_pdf(objects, trailer=b"/Root 1 0 R /Info 3 0 R"):
+    data, offsets = _body(b"%PDF-1.4\n", objects)
+    xref = len(data)
+    size = max(objects) + 1
+    data += _xref_table({0: 0, **offsets}).replace(
+        b"0000000000 00000 n", b"0000000000 65535 f", 1
+    )
+    data += b"trailer\n<< /Size %d " % size + trailer + b" >>\n"
+    return data + b"startxref\n%d\n%%%%EOF\n" % xref
+
+
+def _incremental_update(data, objects):
+    """Append objects with a new xref section chained to the old one."""
+    prev = int(data.rsplit(b"startxref\n", 1)[1].split(b"\n", 1)[0])
+    data, offsets = _body(data, objects)
+    xref = len(data)
+    data += _xref_table(offsets)
+    data += b"trailer\n<< /Size 20 /Root 1 0 R /Info 3 0 R /Prev %d >>\n" % prev
+    return data + b"startxref\n%d\n%%%%EOF\n" % xref
+
+
+def _xref_stream_pdf(objects):
+    data, offsets = _body(b"%PDF-1.5\n", objects)
+    number = max(objects) + 1
+    offsets[number] = len(data)
+    rows = b"".join(
+        b"\x01" + offsets.get(n, 0).to_bytes(4, "big") + b"\x00"
+        if n in offsets
+        else b"\x00\x00\x00\x00\x00\x00"
+        for n in range(number + 1)
+    )
+    stream = zlib.compress(rows)
+    data += (
+        b"%d 0 obj\n<< /Type /XRef /Size %d /W [1 4 1] /Root 1 0 R /Info 3 0 R "
+        b"/Filter /FlateDecode /Length %d >>\nstream\n"
+        % (number, number + 1, len(stream))
+        + stream
+        + b"\nendstream\nendobj\n"
+    )
+    return data + b"startxref\n%d\n%%%%EOF\n" % offsets[number]
+
+
+def _full_parse(path):
+    with _open_pdf(path) as reader:
+        return _extract_embedded_from_reader(reader)
+
+
+def _write(tmp_path, data, name="doc.pdf"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+def test_classic_table_matches_full_parse(tmp_path):
+    path = _write(tmp_path, _classic_pdf(_objects(page_count=3)))
+
+    fast = _fast_trailer_metadata(path)
+
+    assert fast is not None
+    assert fast[1] == 3
+    assert extract_embedded_metadata(path) == _full_parse(path)
+    assert extract_embedded_metadata(path)[0].title == "Fast Path"
+
+
+def test_incremental_update_uses_newest_objects(tmp_path):
+    data = _classic_pdf(_objects(page_count=2))
+    data = _incremental_update(data, {3: b"<< /Title (Updated) /Author (Jane Roe) >>"})
+    path = _write(tmp_path, data)
+
+    assert _fast_trailer_metadata(path) is not None
+    assert extract_embedded_metadata(path) == _full_parse(path)
+    assert extract_embedded_metadata(path)[0].title == "Updated"
+
+
+def test_xref_stream_falls_back_to_full_parse(tmp_path):
+    path = _write(tmp_path, _xref_stream_pdf(_objects(page_count=2)))
+
+    assert _fast_trailer_metadata(path) is None
+    assert extract_embedded_metadata(path) == _full_parse(path)
+    assert extract_embedded_metadata(path)[1] == 2
+
+
+def test_encrypted_file_falls_back_and_is_rejected(tmp_path):
+    writer = PdfWriter()
+    writer.add_blank_page(612, 792)
+    writer.add_metadata({"/Title": "Secret"})
+    writer.encrypt("password", algorithm="RC4-128")
+    buffer = BytesIO()
+    writer.write(buffer)
+    path = _write(tmp_path, buffer.getvalue())
+
+    assert _fast_trailer_metadata(path) is None
+    with pytest.raises(ValueError, match="password-protected"):
+        extract_embedded_metadata(path)
+
+
+def test_indirect_page_count_falls_back_to_full_parse(tmp_path):
+    objects = _objects(page_count=7, count=b"30 0 R")
+    objects[30] = b"7"
+    path = _write(tmp_path, _classic_pdf(objects))
+
+    assert _fast_trailer_metadata(path) is None
+    assert extract_embedded_metadata(path) == _full_parse(path)
+    assert extract_embedded_metadata(path)[1] == 7
+
+
+def test_indirect_info_value_falls_back_to_full_parse(tmp_path):
+    objects = _objects(info=b"<< /Title 9 0 R /Author (Jane Roe) >>")
+    objects[9] = b"(Indirect Title)"
+    path = _write(tmp_path, _classic_pdf(objects))
+
+    assert _fast_trailer_metadata(path) is None
+    assert extract_embedded_metadata(path) == _full_parse(path)
+    assert extract_embedded_metadata(path)[0].title == "Indirect Title"
+
+
+def test_process_directory_without_files_returns_empty_batch(tmp_path):
+    result = process_directory(
+        tmp_path,
+        [],
+        ExtractionConfig(skip_ai=True),
+        OutputConfig(quiet=True),
+        Console(),
+    )
+
+    assert result.total_files == 0
+    assert result.results == []
+    assert result.errors == []
+
+
+def test_process_directory_stream_frees_yielded_results(tmp_path, monkeypatch):
+    pdf_files = [
+        _write(tmp_path, _classic_pdf(_objects()), f"doc{i}.pdf") for i in range(6)
+    ]
+    futures = {}
+
+    class RecordingExecutor(ProcessPoolExecutor):
+        def submit(self, fn, pdf_file, *args):
+            future = super().submit(fn, pdf_file, *args)
+            futures[pdf_file] = weakref.ref(future)
+            return future
+
+    monkeypatch.setattr(pdf_extractor, "ProcessPoolExecutor", RecordingExecutor)
+
+    yielded = []
+    errors: list[dict] = []
+    for result in process_directory_stream(
+        pdf_files,
+        ExtractionConfig(skip_ai=True),
+        OutputConfig(quiet=True),
+        Console(),
+        errors,
+    ):
+        gc.collect()
+        # Every future before the current one has been dropped
+        assert all(futures[path]() is None for path in yielded)
+        yielded.append(result.file_path)
+
+    assert sorted(yielded) == pdf_files
+    assert errors == []